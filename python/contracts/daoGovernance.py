@@ -125,7 +125,7 @@ class DAOGovernance(sp.Contract):
         total=sp.TNat,
         # The total number of wallets that voted
         participation=sp.TNat).layout(
-            ("positive", ("negative", ("abstain", ("total", "participation")))))
+            (("positive", "negative"), ("abstain", ("total", "participation"))))
 
     PROPOSAL_TYPE = sp.TRecord(
         # The proposal title
@@ -138,6 +138,8 @@ class DAOGovernance(sp.Contract):
         issuer=sp.TAddress,
         # The timestamp when the proposal was submitted
         timestamp=sp.TTimestamp,
+        # The timestamp when the proposal voting period ends
+        end_date=sp.TTimestamp,
         # The block level when the proposal was submitted
         level=sp.TNat,
         # The minimum number of votes needed to approve the proposal
@@ -150,7 +152,7 @@ class DAOGovernance(sp.Contract):
         token_votes=VOTES_SUMMARY_TYPE,
         # The proposal votes summary from the community representatives
         representatives_votes=VOTES_SUMMARY_TYPE).layout(
-            ("title", ("description", ("kind", ("issuer", ("timestamp", ("level", ("quorum", ("gp_index", ("status", ("token_votes", "representatives_votes")))))))))))
+            ((("status", "end_date"), ("gp_index", "issuer")), (("token_votes", "representatives_votes"), (("quorum", "level"), (("timestamp", "kind"), ("title", "description"))))))
 
     VOTE_KIND_TYPE = sp.TVariant(
         # A positive vote
@@ -181,6 +183,12 @@ class DAOGovernance(sp.Contract):
                 ("to_", ("token_id", "amount"))))).layout(
                     ("from_", "txs")))
 
+    # The maximum proposal title and description sizes in bytes. The proposal
+    # full text should be stored off-chain (e.g. in IPFS) and the description
+    # should be a link to it
+    MAX_TITLE_SIZE = 64
+    MAX_DESCRIPTION_SIZE = 128
+
     # Basis for contract instance metadata
     CONTRACT_METADATA_BASE = {
         # TODO: Add other fields, perhaps use a common header?
@@ -222,6 +230,12 @@ class DAOGovernance(sp.Contract):
              'languages': ['en']},
             {'error': {'string': 'DAO_INSUFICIENT_BALANCE'},
              'expansion': {'string': 'ERROR_MISSING_EXPANSION_DATA'},
+             'languages': ['en']},
+            {'error': {'string': 'DAO_TITLE_TOO_LONG'},
+             'expansion': {'string': 'The proposal title is longer than the maximum allowed size.'},
+             'languages': ['en']},
+            {'error': {'string': 'DAO_DESCRIPTION_TOO_LONG'},
+             'expansion': {'string': 'The proposal description is longer than the maximum allowed size. Store the description off-chain and submit a link to it.'},
              'languages': ['en']}]
         }
             
@@ -435,53 +449,65 @@ class DAOGovernance(sp.Contract):
             kind=DAOGovernance.PROPOSAL_KIND_TYPE).layout(
                 ("title", ("description", "kind"))))
 
+        # Check that the proposal title and description are not too long
+        sp.verify(sp.len(params.title) <= DAOGovernance.MAX_TITLE_SIZE,
+                  message="DAO_TITLE_TOO_LONG")
+        sp.verify(sp.len(params.description) <= DAOGovernance.MAX_DESCRIPTION_SIZE,
+                  message="DAO_DESCRIPTION_TOO_LONG")
+
         # Check that one of the DAO members executed the entry point
-        self.check_is_dao_member(self.data.token)
+        token = sp.compute(self.data.token)
+        self.check_is_dao_member(token)
 
         # Check if it's necessary to escrow DAO tokens to create proposals
         gp_index = sp.compute(sp.as_nat(self.data.gp_counter - 1))
-        escrow_amount = sp.compute(
-            self.data.governance_parameters[gp_index].escrow_amount)
+        gp = sp.compute(self.data.governance_parameters[gp_index])
+        escrow_amount = sp.compute(gp.escrow_amount)
 
         with sp.if_(escrow_amount > 0):
             # Transfer the DAO tokens from the sender to the DAO contract
             self.transfer_tokens(sp.record(
-                token=self.data.token,
+                token=token,
                 from_=sp.sender,
                 to_=sp.self_address,
                 amount=escrow_amount))
 
+        # Both votes summaries start with zero votes
+        zero_votes = sp.compute(sp.set_type_expr(
+            sp.record(
+                positive=0,
+                negative=0,
+                abstain=0,
+                total=0,
+                participation=0),
+            DAOGovernance.VOTES_SUMMARY_TYPE))
+
         # Add the new proposal information to the proposals big map
-        self.data.proposals[self.data.counter] = sp.record(
+        counter = sp.compute(self.data.counter)
+        self.data.proposals[counter] = sp.record(
             title=params.title,
             description=params.description,
             kind=params.kind,
             issuer=sp.sender,
             timestamp=sp.now,
+            end_date=sp.now.add_days(sp.to_int(gp.vote_period)),
             level=sp.level,
             quorum=self.data.quorum,
             gp_index=gp_index,
             status=sp.variant("open", sp.unit),
-            token_votes=sp.record(
-                positive=0,
-                negative=0,
-                abstain=0,
-                total=0,
-                participation=0),
-            representatives_votes=sp.record(
-                positive=0,
-                negative=0,
-                abstain=0,
-                total=0,
-                participation=0))
+            token_votes=zero_votes,
+            representatives_votes=zero_votes)
 
         # Increase the proposals counter
-        self.data.counter += 1
+        self.data.counter = counter + 1
 
     @sp.entry_point
     def token_vote(self, params):
         """Adds a new DAO token holder vote for a given proposal.
 
+        The proposal issuer can pass max_checkpoints=sp.some(0) to vote only
+        with the tokens in escrow, without calling the token balance view.
+
         """
         # Define the input parameter data type
         sp.set_type(params, sp.TRecord(
@@ -491,29 +517,37 @@ class DAOGovernance(sp.Contract):
                 ("proposal_id", ("vote", "max_checkpoints"))))
 
         # Check that the proposal exists
-        proposal = sp.compute(self.data.proposals.get(
+        proposal = sp.local("proposal", self.data.proposals.get(
             params.proposal_id, message="DAO_INEXISTENT_PROPOSAL"))
 
         # Check that the proposal status is still set as open
-        sp.verify(proposal.status.is_variant("open"),
+        sp.verify(proposal.value.status.is_variant("open"),
                   message="DAO_STATUS_NOT_OPEN")
 
         # Check that the proposal voting period didn't expire
-        gp = sp.compute(self.data.governance_parameters[proposal.gp_index])
-        end_date = proposal.timestamp.add_days(sp.to_int(gp.vote_period))
-        sp.verify(sp.now < end_date, message="DAO_CLOSED_PROPOSAL")
+        sp.verify(sp.now < proposal.value.end_date,
+                  message="DAO_CLOSED_PROPOSAL")
 
         # Check that the member didn't vote the proposal before
-        vote_key = sp.pair(params.proposal_id, sp.sender)
+        vote_key = sp.compute(sp.pair(params.proposal_id, sp.sender))
         sp.verify(~self.data.token_votes.contains(vote_key),
                   message="DAO_ALREADY_VOTED")
 
-        # Get the member DAO token balance at the proposal creation
-        token_balance = sp.local("token_balance", self.get_prior_token_balance(
-            proposal.level, params.max_checkpoints))
+        # Get the member DAO token balance at the proposal creation.
+        # max_checkpoints=sp.some(0) is a convention reserved to the proposal
+        # issuer: it skips the token view call and the vote only counts the
+        # tokens in escrow. The token view rejects that value with
+        # FA2_WRONG_MAX_CHECKPOINTS, so any other voter using it still fails
+        gp = sp.compute(self.data.governance_parameters[proposal.value.gp_index])
+        is_issuer = sp.compute(sp.sender == proposal.value.issuer)
+        token_balance = sp.local("token_balance", sp.nat(0))
+
+        with sp.if_(~(is_issuer & (params.max_checkpoints == sp.some(sp.nat(0))))):
+            token_balance.value = self.get_prior_token_balance(
+                proposal.value.level, params.max_checkpoints)
 
         # Add the amount of tokens in escrow if the voter is the proposal issuer
-        with sp.if_(sp.sender == proposal.issuer):
+        with sp.if_(is_issuer):
             token_balance.value += gp.escrow_amount
 
         # Check that the token balance is higher than the minimum required amount
@@ -528,19 +562,17 @@ class DAOGovernance(sp.Contract):
             weight.value = 100 * self.integer_square_root(token_balance.value // 10000)
 
         # Update the DAO token holders votes summary
-        new_votes = sp.local("new_votes", proposal.token_votes)
-        new_votes.value.total += weight.value
-        new_votes.value.participation += 1
-
-        with params.vote.match_cases() as arg:
-            with arg.match("yes"):
-                new_votes.value.positive += weight.value
-            with arg.match("no"):
-                new_votes.value.negative += weight.value
-            with arg.match("abstain"):
-                new_votes.value.abstain += weight.value
-
-        self.data.proposals[params.proposal_id].token_votes = new_votes.value
+        proposal.value.token_votes.total += weight.value
+        proposal.value.token_votes.participation += 1
+        proposal.value.token_votes.positive += sp.eif(
+            params.vote.is_variant("yes"), weight.value, 0)
+        proposal.value.token_votes.negative += sp.eif(
+            params.vote.is_variant("no"), weight.value, 0)
+        proposal.value.token_votes.abstain += sp.eif(
+            params.vote.is_variant("abstain"), weight.value, 0)
+
+        # Save the updated proposal with a single big map update
+        self.data.proposals[params.proposal_id] = proposal.value
 
         # Add the vote to the token votes big map
         self.data.token_votes[vote_key] = sp.record(vote=params.vote, weight=weight.value)
@@ -557,17 +589,16 @@ class DAOGovernance(sp.Contract):
                 ("proposal_id", "vote")))
 
         # Check that the proposal exists
-        proposal = sp.compute(self.data.proposals.get(
+        proposal = sp.local("proposal", self.data.proposals.get(
             params.proposal_id, message="DAO_INEXISTENT_PROPOSAL"))
 
         # Check that the proposal status is still set as open
-        sp.verify(proposal.status.is_variant("open"),
+        sp.verify(proposal.value.status.is_variant("open"),
                   message="DAO_STATUS_NOT_OPEN")
 
         # Check that the proposal voting period didn't expire
-        gp = self.data.governance_parameters[proposal.gp_index]
-        end_date = proposal.timestamp.add_days(sp.to_int(gp.vote_period))
-        sp.verify(sp.now < end_date, message="DAO_CLOSED_PROPOSAL")
+        sp.verify(sp.now < proposal.value.end_date,
+                  message="DAO_CLOSED_PROPOSAL")
 
         # Get the representative community
         community = sp.view(
@@ -582,19 +613,17 @@ class DAOGovernance(sp.Contract):
                   message="DAO_ALREADY_VOTED")
 
         # Update the representatives votes summary
-        new_votes = sp.local("new_votes", proposal.representatives_votes)
-        new_votes.value.total += 1
-        new_votes.value.participation += 1
-
-        with params.vote.match_cases() as arg:
-            with arg.match("yes"):
-                new_votes.value.positive += 1
-            with arg.match("no"):
-                new_votes.value.negative += 1
-            with arg.match("abstain"):
-                new_votes.value.abstain += 1
-
-        self.data.proposals[params.proposal_id].representatives_votes = new_votes.value
+        proposal.value.representatives_votes.total += 1
+        proposal.value.representatives_votes.participation += 1
+        proposal.value.representatives_votes.positive += sp.eif(
+            params.vote.is_variant("yes"), 1, 0)
+        proposal.value.representatives_votes.negative += sp.eif(
+            params.vote.is_variant("no"), 1, 0)
+        proposal.value.representatives_votes.abstain += sp.eif(
+            params.vote.is_variant("abstain"), 1, 0)
+
+        # Save the updated proposal with a single big map update
+        self.data.proposals[params.proposal_id] = proposal.value
 
         # Add the vote to the representatives votes big map
         self.data.representatives_votes[vote_key] = params.vote
@@ -611,47 +640,45 @@ class DAOGovernance(sp.Contract):
                 ("proposal_id", "return_escrow")))
 
         # Check that the proposal exists
-        proposal = sp.compute(self.data.proposals.get(
+        proposal = sp.local("proposal", self.data.proposals.get(
             params.proposal_id, message="DAO_INEXISTENT_PROPOSAL"))
 
         # Check that the address that called the entry point is the proposal
         # issuer or the DAO guardians
-        sp.verify((sp.sender == proposal.issuer) | 
+        sp.verify((sp.sender == proposal.value.issuer) | 
                   (sp.sender == self.data.guardians),
                   message="DAO_NOT_ISSUER_NOR_GUARDIAN")
 
         # Check that the proposal status is set as open or approved
-        sp.verify(proposal.status.is_variant("open") | 
-                  proposal.status.is_variant("approved"),
+        sp.verify(proposal.value.status.is_variant("open") | 
+                  proposal.value.status.is_variant("approved"),
                   message="DAO_STATUS_NOT_OPEN_OR_APPROVED")
 
         # Check if there are still some DAO tokens in escrow
-        gp = sp.compute(self.data.governance_parameters[proposal.gp_index])
+        gp = sp.compute(self.data.governance_parameters[proposal.value.gp_index])
 
-        with sp.if_(proposal.status.is_variant("open") & (gp.escrow_amount > 0)):
+        with sp.if_(proposal.value.status.is_variant("open") & (gp.escrow_amount > 0)):
             # Calculate the proposal total votes
-            total_votes = self.calculate_total_votes(sp.record(
-                token_votes=proposal.token_votes,
-                representatives_votes=proposal.representatives_votes,
-                quorum=proposal.quorum,
-                representatives_share=gp.representatives_share))
+            total_votes = sp.compute(self.calculate_total_votes(sp.record(
+                token_votes=proposal.value.token_votes,
+                representatives_votes=proposal.value.representatives_votes,
+                quorum=proposal.value.quorum,
+                representatives_share=gp.representatives_share)))
 
             # Check which address should receive the DAO tokens
-            receiver = sp.local("receiver", self.data.treasury)
-            return_escrow = params.return_escrow & (total_votes.positive > (((total_votes.positive + total_votes.negative) * gp.escrow_return) // 100))
-
-            with sp.if_(return_escrow):
-                receiver.value = proposal.issuer
+            return_escrow = params.return_escrow & ((total_votes.positive * 100) > ((total_votes.positive + total_votes.negative) * gp.escrow_return))
+            receiver = sp.eif(return_escrow, proposal.value.issuer, self.data.treasury)
 
             # Transfer the DAO tokens
             self.transfer_tokens(sp.record(
                 token=self.data.token,
                 from_=sp.self_address,
-                to_=receiver.value,
+                to_=receiver,
                 amount=gp.escrow_amount))
 
         # Set the proposal status as cancelled
-        self.data.proposals[params.proposal_id].status = sp.variant("cancelled", sp.unit)
+        proposal.value.status = sp.variant("cancelled", sp.unit)
+        self.data.proposals[params.proposal_id] = proposal.value
 
     @sp.entry_point
     def evaluate_voting_result(self, proposal_id):
@@ -661,56 +688,65 @@ class DAOGovernance(sp.Contract):
         # Define the input parameter data type
         sp.set_type(proposal_id, sp.TNat)
 
-        # Check that one of the DAO members executed the entry point
-        self.check_is_dao_member(self.data.token)
-
         # Check that the proposal exists
-        proposal = sp.compute(self.data.proposals.get(
+        proposal = sp.local("proposal", self.data.proposals.get(
             proposal_id, message="DAO_INEXISTENT_PROPOSAL"))
 
+        # Check that one of the DAO members executed the entry point. The
+        # proposal issuer and the DAO treasury don't need the token view call
+        token = sp.compute(self.data.token)
+
+        with sp.if_((sp.sender != proposal.value.issuer) &
+                    (sp.sender != self.data.treasury)):
+            self.check_is_dao_member(token)
+
         # Check that the proposal status is still set as open
-        sp.verify(proposal.status.is_variant("open"),
+        sp.verify(proposal.value.status.is_variant("open"),
                   message="DAO_STATUS_NOT_OPEN")
 
         # Check that the proposal voting period has finished
-        gp = sp.compute(self.data.governance_parameters[proposal.gp_index])
-        end_date = proposal.timestamp.add_days(sp.to_int(gp.vote_period))
-        sp.verify(sp.now > end_date, message="DAO_OPEN_PROPOSAL")
+        sp.verify(sp.now > proposal.value.end_date, message="DAO_OPEN_PROPOSAL")
+
+        # Get the proposal governance parameters
+        gp = sp.compute(self.data.governance_parameters[proposal.value.gp_index])
 
         # Calculate the proposal total votes
-        total_votes = self.calculate_total_votes(sp.record(
-            token_votes=proposal.token_votes,
-            representatives_votes=proposal.representatives_votes,
-            quorum=proposal.quorum,
-            representatives_share=gp.representatives_share))
+        total_votes = sp.compute(self.calculate_total_votes(sp.record(
+            token_votes=proposal.value.token_votes,
+            representatives_votes=proposal.value.representatives_votes,
+            quorum=proposal.value.quorum,
+            representatives_share=gp.representatives_share)))
+
+        # Get the number of positive and negative votes, used by the escrow
+        # and the super-majority thresholds. The thresholds are compared
+        # multiplying both sides by 100 to avoid the divisions
+        positive_and_negative = sp.compute(total_votes.positive + total_votes.negative)
+        scaled_positive = sp.compute(total_votes.positive * 100)
 
         # Check if there are some DAO tokens in escrow
         with sp.if_(gp.escrow_amount > 0):
             # Check which address should receive the DAO tokens
-            receiver = sp.local("receiver", self.data.treasury)
-            return_escrow = total_votes.positive > (((total_votes.positive + total_votes.negative) * gp.escrow_return) // 100)
-
-            with sp.if_(return_escrow):
-                receiver.value = proposal.issuer
+            return_escrow = scaled_positive > (positive_and_negative * gp.escrow_return)
+            receiver = sp.eif(return_escrow, proposal.value.issuer, self.data.treasury)
 
             # Transfer the DAO tokens
             self.transfer_tokens(sp.record(
-                token=self.data.token,
+                token=token,
                 from_=sp.self_address,
-                to_=receiver.value,
+                to_=receiver,
                 amount=gp.escrow_amount))
 
         # Check if the proposal passed the required thresholds to be approved
-        passed_supermajority = sp.compute(total_votes.positive > (((total_votes.positive + total_votes.negative) * gp.supermajority) // 100))
-        passed_quorum = total_votes.total > proposal.quorum
+        passed_supermajority = sp.compute(scaled_positive > (positive_and_negative * gp.supermajority))
+        passed_quorum = total_votes.total > proposal.value.quorum
 
         # Set the proposal status as rejected or approved depending on the result
-        new_status = sp.local("new_status", sp.variant("rejected", sp.unit))
+        proposal.value.status = sp.variant("rejected", sp.unit)
 
         with sp.if_(passed_supermajority & passed_quorum):
-            new_status.value = sp.variant("approved", sp.unit)
+            proposal.value.status = sp.variant("approved", sp.unit)
 
-        self.data.proposals[proposal_id].status = new_status.value
+        self.data.proposals[proposal_id] = proposal.value
 
         # Check that the voting weight method didn't change
         gp_index = sp.as_nat(self.data.gp_counter - 1)
@@ -725,14 +761,15 @@ class DAOGovernance(sp.Contract):
 
             with sp.if_((sp.now > min_quorum_update_date) & passed_supermajority):
                 # Calculate the new quorum value
-                current_quorum_contribution = self.data.quorum * sp.as_nat(100 - current_gp.quorum_update)
+                current_quorum = sp.compute(self.data.quorum)
+                current_quorum_contribution = current_quorum * sp.as_nat(100 - current_gp.quorum_update)
                 proposal_contribution = total_votes.total * current_gp.quorum_update
                 new_quorum = sp.local("new_quorum", (current_quorum_contribution + proposal_contribution) // 100)
 
                 # Check that the quorum doesn't decrease or increase too fast
                 quorum_max_relative_change = sp.compute(100 + current_gp.quorum_max_change)
-                min_quorum = (self.data.quorum * 100) // quorum_max_relative_change
-                max_quorum = (self.data.quorum * quorum_max_relative_change) // 100
+                min_quorum = (current_quorum * 100) // quorum_max_relative_change
+                max_quorum = (current_quorum * quorum_max_relative_change) // 100
                 new_quorum.value = sp.max(min_quorum, new_quorum.value)
                 new_quorum.value = sp.min(new_quorum.value, max_quorum)
 
@@ -752,29 +789,30 @@ class DAOGovernance(sp.Contract):
         # Define the input parameter data type
         sp.set_type(proposal_id, sp.TNat)
 
-        # Check that one of the DAO members executed the entry point
-        self.check_is_dao_member(self.data.token)
-
         # Check that the proposal exists
-        proposal = sp.compute(self.data.proposals.get(
+        proposal = sp.local("proposal", self.data.proposals.get(
             proposal_id, message="DAO_INEXISTENT_PROPOSAL"))
 
+        # Check that one of the DAO members executed the entry point. The
+        # proposal issuer doesn't need the token view call
+        with sp.if_(sp.sender != proposal.value.issuer):
+            self.check_is_dao_member(self.data.token)
+
         # Check that the proposal is approved
-        sp.verify(proposal.status.is_variant("approved"),
+        sp.verify(proposal.value.status.is_variant("approved"),
                   message="DAO_STATUS_NOT_APPROVED")
 
         # Check that the proposal waiting period has finished
-        gp = sp.compute(self.data.governance_parameters[proposal.gp_index])
-        end_date = proposal.timestamp.add_days(
-            sp.to_int(gp.vote_period + gp.wait_period))
+        wait_period = self.data.governance_parameters[proposal.value.gp_index].wait_period
+        end_date = proposal.value.end_date.add_days(sp.to_int(wait_period))
         sp.verify(sp.now > end_date, message="DAO_WAITING_PROPOSAL")
 
         # Set the proposal status as executed
-        self.data.proposals[proposal_id].status = sp.variant(
-            "executed", sp.unit)
+        proposal.value.status = sp.variant("executed", sp.unit)
+        self.data.proposals[proposal_id] = proposal.value
 
         # Execute the proposal
-        with proposal.kind.match_cases() as arg:
+        with proposal.value.kind.match_cases() as arg:
             with arg.match("transfer_mutez") as mutez_transfers:
                 # Get a handle to the DAO treasury transfer mutez entry point
                 transfer_mutez_handle = sp.contract(
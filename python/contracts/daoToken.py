@@ -172,7 +172,6 @@ class DAOToken(sp.Contract):
         """
         sp.verify(sp.sender == self.data.administrator, message="FA2_NOT_ADMIN")
 
-    @sp.private_lambda(with_storage=None, wrap_call=True)
     def check_token_exists(self, token_id):
         """Checks that the given token exists.
 
@@ -180,25 +179,35 @@ class DAOToken(sp.Contract):
         sp.verify(token_id == 0, message="FA2_TOKEN_UNDEFINED")
 
     @sp.private_lambda(with_storage="read-write", wrap_call=True)
-    def add_checkpoint(self, owner):
+    def add_checkpoint(self, params):
         """Adds a new checkpoint to the checkpoints big map.
 
         """
-        # Get the owner current balance
-        balance = sp.compute(self.data.ledger[owner])
+        # Define the input parameter data type
+        sp.set_type(params, sp.TRecord(
+            owner=sp.TAddress,
+            balance=sp.TNat).layout(("owner", "balance")))
+
+        # Get the owner and its current balance
+        owner = sp.compute(params.owner)
+        balance = sp.compute(params.balance)
 
         # Check if the owner has already some checkpoints
         with sp.if_(self.data.n_checkpoints.contains(owner)):
             # Get the last checkpoint index
             index = sp.compute(sp.as_nat(self.data.n_checkpoints[owner] - 1))
 
+            # Get the last checkpoint
+            last_checkpoint = sp.compute(self.data.checkpoints[(owner, index)])
+
             # Check if the last checkpoint is at the same block level
-            with sp.if_(self.data.checkpoints[(owner, index)].level == sp.level):
+            with sp.if_(last_checkpoint.level == sp.level):
                 # Update the checkpoint balance
-                self.data.checkpoints[(owner, index)].balance = balance
+                self.data.checkpoints[(owner, index)] = sp.record(
+                    level=sp.level, balance=balance)
             with sp.else_():
                 # Check that the balance has changed
-                with sp.if_(self.data.checkpoints[(owner, index)].balance != balance):
+                with sp.if_(last_checkpoint.balance != balance):
                     # Add a new checkpoint
                     self.data.checkpoints[(owner, index + 1)] = sp.record(
                         level=sp.level, balance=balance)
@@ -230,39 +239,63 @@ class DAOToken(sp.Contract):
 
         # Loop over the list of transfers
         with sp.for_("transfer", params) as transfer:
+            # The owner is the same for all the transfer txs
+            owner = sp.compute(transfer.from_)
+            sender_is_owner = sp.compute(sp.sender == owner)
+
             with sp.for_("tx", transfer.txs) as tx:
                 # Check that the token exists
                 self.check_token_exists(tx.token_id)
 
                 # Check that the sender is one of the token operators
-                owner = sp.compute(transfer.from_)
-                sp.verify(
-                    (sp.sender == owner) | 
-                    self.data.operators.contains(sp.record(
-                        owner=owner,
-                        operator=sp.sender,
-                        token_id=0)),
-                    message="FA2_NOT_OPERATOR")
+                with sp.if_(~sender_is_owner):
+                    sp.verify(
+                        self.data.operators.contains(sp.record(
+                            owner=owner,
+                            operator=sp.sender,
+                            token_id=0)),
+                        message="FA2_NOT_OPERATOR")
 
                 # Check that the transfer amount is not zero
                 with sp.if_(tx.amount > 0):
-                    # Remove the token amount from the owner
-                    self.data.ledger[owner] = sp.as_nat(
-                        self.data.ledger.get(owner, 0) - tx.amount,
-                        "FA2_INSUFFICIENT_BALANCE")
-
-                    # Add the token amount to the new owner
-                    self.data.ledger[tx.to_] = self.data.ledger.get(
-                        tx.to_, 0) + tx.amount
-
-                    # Check that the balance is lower than the maximum share
-                    sp.verify(self.data.max_share_exceptions.contains(tx.to_) | 
-                              (self.data.ledger[tx.to_] < self.data.max_share),
-                              message="FA2_SHARE_EXCESS")
-
-                    # Add the new balance checkpoints
-                    self.add_checkpoint(owner)
-                    self.add_checkpoint(tx.to_)
+                    # Self transfers don't change any balance
+                    with sp.if_(owner != tx.to_):
+                        # Remove the token amount from the owner
+                        owner_balance = sp.compute(sp.as_nat(
+                            self.data.ledger.get(owner, 0) - tx.amount,
+                            "FA2_INSUFFICIENT_BALANCE"))
+                        self.data.ledger[owner] = owner_balance
+
+                        # Add the token amount to the new owner
+                        new_owner_balance = sp.compute(
+                            self.data.ledger.get(tx.to_, 0) + tx.amount)
+                        self.data.ledger[tx.to_] = new_owner_balance
+
+                        # Check that the balance is lower than the maximum share
+                        sp.verify(self.data.max_share_exceptions.contains(tx.to_) | 
+                                  (new_owner_balance < self.data.max_share),
+                                  message="FA2_SHARE_EXCESS")
+
+                        # Add the new balance checkpoints
+                        self.add_checkpoint(sp.record(
+                            owner=owner, balance=owner_balance))
+                        self.add_checkpoint(sp.record(
+                            owner=tx.to_, balance=new_owner_balance))
+                    with sp.else_():
+                        # Check that the owner has enough tokens
+                        owner_balance = sp.compute(self.data.ledger.get(owner, 0))
+                        sp.verify(owner_balance >= tx.amount,
+                                  message="FA2_INSUFFICIENT_BALANCE")
+
+                        # Check that the balance is lower than the maximum share
+                        sp.verify(self.data.max_share_exceptions.contains(owner) | 
+                                  (owner_balance < self.data.max_share),
+                                  message="FA2_SHARE_EXCESS")
+
+                        # Add the balance checkpoint, which is needed if the
+                        # owner got the tokens without one (e.g. at origination)
+                        self.add_checkpoint(sp.record(
+                            owner=owner, balance=owner_balance))
 
     @sp.entry_point
     def balance_of(self, params):
@@ -164,7 +164,7 @@ class HarbergerToken(sp.Contract):
             destination=add_fee_handle)
 
         # Increase the tokens counter
-        self.data.counter += 1
+        self.data.counter = token_id + 1
 
     @sp.entry_point
     def transfer(self, params):
@@ -184,24 +184,34 @@ class HarbergerToken(sp.Contract):
         # Check that no tez have been transferred
         self.check_no_tez_transfer()
 
+        # Check if the sender is the fees contract
+        # The option is compared directly, so transfers don't fail while the
+        # fees contract is not set
+        sender_is_fees_contract = sp.compute(
+            self.data.fees_contract == sp.some(sp.sender))
+
         # Loop over the list of transfers
         with sp.for_("transfer", params) as transfer:
+            # The owner and the sender rights are the same for all the txs
+            owner = sp.compute(transfer.from_)
+            is_owner_or_fees_contract = sp.compute(
+                (sp.sender == owner) | sender_is_fees_contract)
+
             with sp.for_("tx", transfer.txs) as tx:
                 # Check that the token exists
                 token_id = sp.compute(tx.token_id)
                 self.check_token_exists(token_id)
 
                 # Check that the sender is one of the token operators
-                owner = sp.compute(transfer.from_)
-                fees_contract = self.data.fees_contract.open_some()
-                sp.verify(
-                    (sp.sender == owner) | 
-                    (sp.sender == fees_contract) | 
-                    self.data.operators.contains(sp.record(
-                        owner=owner,
-                        operator=sp.sender,
-                        token_id=token_id)),
-                    message="FA2_NOT_OPERATOR")
+                # The operators big map is only checked if the sender is not
+                # the owner or the fees contract
+                with sp.if_(~is_owner_or_fees_contract):
+                    sp.verify(
+                        self.data.operators.contains(sp.record(
+                            owner=owner,
+                            operator=sp.sender,
+                            token_id=token_id)),
+                        message="FA2_NOT_OPERATOR")
 
                 # Check that the transfer amount is not zero
                 with sp.if_(tx.amount > 0):
@@ -216,6 +216,18 @@ def test_text_proposal():
         kind=proposal_kind).run(
             valid=False, sender=user5, now=sp.timestamp(100), exception="FA2_INSUFFICIENT_BALANCE")
 
+    # Check that proposals with too long titles or descriptions are rejected
+    dao.create_proposal(
+        title=sp.utils.bytes_of_string("a" * 65),
+        description=proposal_description,
+        kind=proposal_kind).run(
+            valid=False, sender=user4, now=sp.timestamp(100), exception="DAO_TITLE_TOO_LONG")
+    dao.create_proposal(
+        title=proposal_title,
+        description=sp.utils.bytes_of_string("a" * 129),
+        kind=proposal_kind).run(
+            valid=False, sender=user4, now=sp.timestamp(100), exception="DAO_DESCRIPTION_TOO_LONG")
+
     # User 4 creates a proposal
     dao.create_proposal(
         title=proposal_title,
@@ -229,6 +241,7 @@ def test_text_proposal():
     scenario.verify(dao.data.proposals[0].kind.is_variant("text"))
     scenario.verify(dao.data.proposals[0].issuer == user4.address)
     scenario.verify(dao.data.proposals[0].timestamp == sp.timestamp(100))
+    scenario.verify(dao.data.proposals[0].end_date == sp.timestamp(100).add_days(5))
     scenario.verify(dao.data.proposals[0].level == 10)
     scenario.verify(dao.data.proposals[0].quorum == dao.data.quorum)
     scenario.verify(dao.data.proposals[0].gp_index == 0)
@@ -277,6 +290,10 @@ def test_text_proposal():
     dao.representatives_vote(proposal_id=0, vote=sp.variant("yes", sp.unit)).run(
         valid=False, sender=user4, now=sp.timestamp(400), level=40, exception="REPS_NOT_REPRESENTATIVE")
 
+    # Check that only the proposal issuer can skip the token balance view
+    dao.token_vote(proposal_id=0, vote=sp.variant("yes", sp.unit), max_checkpoints=sp.some(0)).run(
+        valid=False, sender=user3, now=sp.timestamp(400), level=40, exception="FA2_WRONG_MAX_CHECKPOINTS")
+
     # User 3, 4 and 5 vote as normal users
     dao.token_vote(proposal_id=0, vote=sp.variant("yes", sp.unit), max_checkpoints=sp.none).run(
         sender=user3, now=sp.timestamp(400), level=40)
@@ -366,6 +383,112 @@ def test_text_proposal():
         valid=False, sender=user1, now=sp.timestamp(101).add_days(5 + 2), exception="DAO_STATUS_NOT_APPROVED")
 
 
+@sp.add_test(name="Test issuer escrow vote")
+def test_issuer_escrow_vote():
+    # Get the test environment
+    testEnvironment = get_test_environment()
+    scenario = testEnvironment["scenario"]
+    user3 = testEnvironment["user3"]
+    user4 = testEnvironment["user4"]
+    dao = testEnvironment["dao"]
+
+    # User 4 creates a proposal
+    dao.create_proposal(
+        title=sp.utils.bytes_of_string("Dummy title"),
+        description=sp.utils.bytes_of_string("Dummy description"),
+        kind=sp.variant("text", sp.unit)).run(
+            sender=user4, level=10, now=sp.timestamp(100))
+
+    # Check that only the proposal issuer can skip the token balance view
+    dao.token_vote(proposal_id=0, vote=sp.variant("yes", sp.unit), max_checkpoints=sp.some(0)).run(
+        valid=False, sender=user3, now=sp.timestamp(200), level=20, exception="FA2_WRONG_MAX_CHECKPOINTS")
+
+    # The proposal issuer votes only with the tokens in escrow
+    dao.token_vote(proposal_id=0, vote=sp.variant("yes", sp.unit), max_checkpoints=sp.some(0)).run(
+        sender=user4, now=sp.timestamp(200), level=20)
+
+    # Check that the vote weight is the escrow amount and not the full balance
+    scenario.verify(dao.data.proposals[0].token_votes.total == 10)
+    scenario.verify(dao.data.proposals[0].token_votes.positive == 10)
+    scenario.verify(dao.data.proposals[0].token_votes.participation == 1)
+    scenario.verify(dao.data.token_votes[(0, user4.address)].vote.is_variant("yes"))
+    scenario.verify(dao.data.token_votes[(0, user4.address)].weight == 10)
+
+    # Check that the issuer cannot vote again with the full balance
+    dao.token_vote(proposal_id=0, vote=sp.variant("yes", sp.unit), max_checkpoints=sp.none).run(
+        valid=False, sender=user4, now=sp.timestamp(300), level=30, exception="DAO_ALREADY_VOTED")
+
+
+@sp.add_test(name="Test non member issuer")
+def test_non_member_issuer():
+    # Get the test environment
+    testEnvironment = get_test_environment()
+    scenario = testEnvironment["scenario"]
+    user1 = testEnvironment["user1"]
+    user2 = testEnvironment["user2"]
+    user3 = testEnvironment["user3"]
+    user4 = testEnvironment["user4"]
+    user5 = testEnvironment["user5"]
+    external_user = testEnvironment["external_user"]
+    token = testEnvironment["token"]
+    dao = testEnvironment["dao"]
+
+    # User 4 creates a proposal
+    dao.create_proposal(
+        title=sp.utils.bytes_of_string("Dummy title"),
+        description=sp.utils.bytes_of_string("Dummy description"),
+        kind=sp.variant("text", sp.unit)).run(
+            sender=user4, level=10, now=sp.timestamp(100))
+
+    # User 4 transfers all their remaining tokens and stops being a DAO member
+    token.transfer([
+        sp.record(
+            from_=user4.address,
+            txs=[sp.record(to_=user1.address, token_id=0, amount=400 - 10)])
+        ]).run(sender=user4, level=15)
+    scenario.verify(token.data.ledger[user4.address] == 0)
+
+    # Vote the proposal
+    dao.representatives_vote(proposal_id=0, vote=sp.variant("abstain", sp.unit)).run(
+        sender=user1, now=sp.timestamp(200), level=20)
+    dao.representatives_vote(proposal_id=0, vote=sp.variant("yes", sp.unit)).run(
+        sender=user2, now=sp.timestamp(200), level=20)
+    dao.token_vote(proposal_id=0, vote=sp.variant("yes", sp.unit), max_checkpoints=sp.none).run(
+        sender=user1, now=sp.timestamp(200), level=20)
+    dao.token_vote(proposal_id=0, vote=sp.variant("yes", sp.unit), max_checkpoints=sp.none).run(
+        sender=user3, now=sp.timestamp(200), level=20)
+    dao.token_vote(proposal_id=0, vote=sp.variant("yes", sp.unit), max_checkpoints=sp.none).run(
+        sender=user4, now=sp.timestamp(200), level=20)
+    dao.token_vote(proposal_id=0, vote=sp.variant("no", sp.unit), max_checkpoints=sp.none).run(
+        sender=user5, now=sp.timestamp(200), level=20)
+
+    # Check that non-DAO members that are not the issuer cannot evaluate the proposal
+    dao.evaluate_voting_result(0).run(
+        valid=False, sender=external_user, now=sp.timestamp(101).add_days(5), level=60, exception="DAO_NOT_MEMBER")
+
+    # Check that the proposal issuer can evaluate the proposal without tokens
+    dao.evaluate_voting_result(0).run(
+        sender=user4, now=sp.timestamp(101).add_days(5), level=60)
+    scenario.verify(dao.data.proposals[0].status.is_variant("approved"))
+
+    # User 4 transfers back the tokens in escrow
+    scenario.verify(token.data.ledger[user4.address] == 10)
+    token.transfer([
+        sp.record(
+            from_=user4.address,
+            txs=[sp.record(to_=user2.address, token_id=0, amount=10)])
+        ]).run(sender=user4, level=65)
+    scenario.verify(token.data.ledger[user4.address] == 0)
+
+    # Check that non-DAO members that are not the issuer cannot execute the proposal
+    dao.execute_proposal(0).run(
+        valid=False, sender=external_user, now=sp.timestamp(101).add_days(5 + 2), exception="DAO_NOT_MEMBER")
+
+    # Check that the proposal issuer can execute the proposal without tokens
+    dao.execute_proposal(0).run(sender=user4, now=sp.timestamp(101).add_days(5 + 2))
+    scenario.verify(dao.data.proposals[0].status.is_variant("executed"))
+
+
 @sp.add_test(name="Test transfer mutez proposal")
 def test_transfer_mutez_proposal():
     # Get the test environment
@@ -140,6 +140,13 @@ def test_transfer():
             txs=[sp.record(to_=user3.address, token_id=0, amount=3)])
         ]).run(valid=False, sender=admin, exception="FA2_NOT_OPERATOR")
 
+    # Check that zero amount transfers also need to be done by an operator
+    fa2.transfer([
+        sp.record(
+            from_=user1.address,
+            txs=[sp.record(to_=user3.address, token_id=0, amount=0)])
+        ]).run(valid=False, sender=user3, exception="FA2_NOT_OPERATOR")
+
     # Check that the owner can transfer the tokens
     fa2.transfer([
         sp.record(
@@ -395,6 +402,70 @@ def test_complex_transfer():
     scenario.verify(fa2.data.checkpoints[(user3.address, 1)].balance == 3 + 2 + 1)
 
 
+@sp.add_test(name="Test self transfer")
+def test_self_transfer():
+    # Get the test environment
+    testEnvironment = get_test_environment()
+    scenario = testEnvironment["scenario"]
+    admin = testEnvironment["admin"]
+    user1 = testEnvironment["user1"]
+    fa2 = testEnvironment["fa2"]
+
+    # Check that the admin cannot transfer to themselves more than the maximum share
+    fa2.transfer([
+        sp.record(
+            from_=admin.address,
+            txs=[sp.record(to_=admin.address, token_id=0, amount=1)])
+        ]).run(valid=False, sender=admin, level=5, exception="FA2_SHARE_EXCESS")
+
+    # Add the admin to the maximum share exceptions
+    fa2.add_max_share_exception(admin.address).run(sender=admin)
+
+    # Check that a self transfer adds the admin first checkpoint
+    fa2.transfer([
+        sp.record(
+            from_=admin.address,
+            txs=[sp.record(to_=admin.address, token_id=0, amount=1)])
+        ]).run(sender=admin, level=5)
+
+    # Check that the contract information has been updated
+    scenario.verify(fa2.get_balance(sp.record(owner=admin.address, token_id=0)) == 1000000000000)
+    scenario.verify(fa2.data.n_checkpoints[admin.address] == 1)
+    scenario.verify(fa2.data.checkpoints[(admin.address, 0)].level == 5)
+    scenario.verify(fa2.data.checkpoints[(admin.address, 0)].balance == 1000000000000)
+
+    # Transfer some editions from the admin to the first user
+    fa2.transfer([
+        sp.record(
+            from_=admin.address,
+            txs=[sp.record(to_=user1.address, token_id=0, amount=10)])
+        ]).run(sender=admin, level=10)
+
+    # Check that the admin prior balance is known from the self transfer level
+    scenario.verify(fa2.get_prior_balance(sp.record(owner=admin.address, max_checkpoints=sp.none, level=4)) == 0)
+    scenario.verify(fa2.get_prior_balance(sp.record(owner=admin.address, max_checkpoints=sp.none, level=5)) == 1000000000000)
+    scenario.verify(fa2.get_prior_balance(sp.record(owner=admin.address, max_checkpoints=sp.none, level=9)) == 1000000000000)
+
+    # Check that a self transfer doesn't change the balance or the checkpoints
+    fa2.transfer([
+        sp.record(
+            from_=user1.address,
+            txs=[sp.record(to_=user1.address, token_id=0, amount=10)])
+        ]).run(sender=user1, level=20)
+
+    scenario.verify(fa2.get_balance(sp.record(owner=user1.address, token_id=0)) == 10)
+    scenario.verify(fa2.data.n_checkpoints[user1.address] == 1)
+    scenario.verify(fa2.data.checkpoints[(user1.address, 0)].level == 10)
+    scenario.verify(fa2.data.checkpoints[(user1.address, 0)].balance == 10)
+
+    # Check that a self transfer fails if the owner doesn't have enough tokens
+    fa2.transfer([
+        sp.record(
+            from_=user1.address,
+            txs=[sp.record(to_=user1.address, token_id=0, amount=11)])
+        ]).run(valid=False, sender=user1, level=30, exception="FA2_INSUFFICIENT_BALANCE")
+
+
 @sp.add_test(name="Test prior balance")
 def test_prior_balance():
     # Get the test environment
@@ -89,6 +89,13 @@ def test_mint_multiple():
     royalties = sp.record(
         minter=sp.record(address=user1.address, royalties=0),
         creator=sp.record(address=user2.address, royalties=50))
+
+    # Check that it's not possible to mint an empty collection
+    fa2.mint_collection(
+        total=0,
+        base=base,
+        royalties=royalties).run(valid=False, sender=admin)
+
     fa2.mint_collection(
         total=total,
         base=base,
@@ -122,6 +129,43 @@ def test_mint_multiple():
     scenario.verify(~fa2.token_exists(3))
     scenario.verify(fa2.last_token_id() == 1)
     scenario.verify(sp.len(fa2.all_tokens()) == 2)
+    scenario.verify_equal(fa2.list_tokens(sp.record(start=0, limit=10)), [0, 1])
+    scenario.verify_equal(fa2.list_tokens(sp.record(start=1, limit=10)), [1])
+    scenario.verify_equal(fa2.list_tokens(sp.record(start=0, limit=1)), [0])
+    scenario.verify(sp.len(fa2.list_tokens(sp.record(start=5, limit=10))) == 0)
+
+
+@sp.add_test(name="Test mint large collection")
+def test_mint_large_collection():
+    # Get the test environment
+    testEnvironment = get_test_environment()
+    scenario = testEnvironment["scenario"]
+    admin = testEnvironment["admin"]
+    user1 = testEnvironment["user1"]
+    fa2 = testEnvironment["fa2"]
+
+    # Check that the admin can mint collections with more than 256 tokens
+    total = 1001
+    base = sp.utils.bytes_of_string(
+        "ipfs://bafybeif7wihgyn4l5mny3m2zzga7rz7ous7szv3w4w54eijowmmcwogezi/")
+    royalties = sp.record(
+        minter=sp.record(address=user1.address, royalties=0),
+        creator=sp.record(address=user1.address, royalties=50))
+    fa2.mint_collection(
+        total=total,
+        base=base,
+        royalties=royalties).run(sender=admin)
+
+    # Check that the token names are the decimal representation of their index
+    scenario.verify(fa2.last_token_id() == 1000)
+    scenario.verify(fa2.token_metadata(
+        0).token_info[""] == base+sp.utils.bytes_of_string("0"))
+    scenario.verify(fa2.token_metadata(
+        10).token_info[""] == base+sp.utils.bytes_of_string("10"))
+    scenario.verify(fa2.token_metadata(
+        256).token_info[""] == base+sp.utils.bytes_of_string("256"))
+    scenario.verify(fa2.token_metadata(
+        1000).token_info[""] == base+sp.utils.bytes_of_string("1000"))
 
 
 @sp.add_test(name="Test collection views")
@@ -182,6 +226,22 @@ def test_collection_views():
     scenario.verify(fa2.token_metadata(
         257).token_info[""] == base[1]+sp.utils.bytes_of_string("1"))
 
+    # Check that the metadata list crosses the collections boundary
+    scenario.verify_equal(
+        fa2.list_token_metadata(sp.record(start=255, limit=3)), [
+            sp.record(token_id=255, token_info={
+                "": base[0]+sp.utils.bytes_of_string("255")}),
+            sp.record(token_id=256, token_info={
+                "": base[1]+sp.utils.bytes_of_string("0")}),
+            sp.record(token_id=257, token_info={
+                "": base[1]+sp.utils.bytes_of_string("1")})])
+
+    # The list is capped to the last minted token
+    scenario.verify(sp.len(fa2.list_token_metadata(
+        sp.record(start=510, limit=10))) == 2)
+    scenario.verify(sp.len(fa2.list_token_metadata(
+        sp.record(start=512, limit=10))) == 0)
+
     """
                 fa2.last_token_id,
                 fa2.last_collection_id,
@@ -213,23 +273,19 @@ def test_collection_views():
 
     collection_cids = fa2.list_collection_cids(collection_range)
 
-    scenario.verify(sp.len(collection_cids) == 2)
-
-    scenario.verify(collection_cids.contains(
-        sp.record(collectionid=0, cid=base[0]))
-    )
-
-    scenario.verify(collection_cids.contains(
-        sp.record(collectionid=1, cid=base[1]))
-    )
+    scenario.verify_equal(collection_cids, [
+        sp.record(collectionid=0, cid=base[0]),
+        sp.record(collectionid=1, cid=base[1])])
 
     collection_cid_single = fa2.list_collection_cids(single_collection_range)
 
-    scenario.verify(sp.len(collection_cid_single) == 1)
+    scenario.verify_equal(collection_cid_single, [
+        sp.record(collectionid=1, cid=base[1])])
 
-    scenario.verify(collection_cid_single.contains(
-        sp.record(collectionid=1, cid=base[1]))
-    )
+    # the end is capped to the last collection
+    scenario.verify_equal(
+        fa2.list_collection_cids(sp.record(start=1, end=2)), [
+            sp.record(collectionid=1, cid=base[1])])
 
     sp.is_failing(~fa2.list_collection_cids(wrong_collection_range))
     sp.is_failing(~fa2.list_collection_cids(inverted_collection_range))
@@ -252,6 +308,10 @@ def test_collection_views():
     scenario.verify(fa2.get_token_collection_id(256) == 1)
     scenario.verify(fa2.get_token_collection_id(300) == 1)
     scenario.verify(fa2.get_token_collection_id(511) == 1)
+    scenario.verify(sp.is_failing(fa2.get_token_collection_id(512)))
+
+    # check that the royalties of a token past the last one are not returned
+    scenario.verify(sp.is_failing(fa2.token_royalties(512)))
 
 @sp.add_test(name="Test collection transfer")
 def test_collection_transfer():